@@ -1 +1,11 @@
-from .scrapper import FilesCache, GumroadScrapper, GumroadSession  # noqa: F401
+__all__ = ["FilesCache", "GumroadScrapper", "GumroadSession", "PagesCache"]
+
+
+def __getattr__(name: str):
+    # Scrapper pulls in requests, rich and selectolax, so it's imported only on demand.
+    if name in __all__:
+        from . import scrapper
+
+        return getattr(scrapper, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
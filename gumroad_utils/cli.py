@@ -1,6 +1,6 @@
 from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
-
-from pathlib3x import Path
+from functools import cache
+from pathlib import Path
 
 __all__ = ["get_cli_arg_parser"]
 
@@ -17,6 +17,7 @@ def _to_path(file_path: str) -> Path:
     return Path(file_path)
 
 
+@cache
 def get_cli_arg_parser() -> ArgumentParser:
     parser = ArgumentParser(
         description="A simple downloader for gumroad.com products",
@@ -60,8 +61,10 @@ def get_cli_arg_parser() -> ArgumentParser:
         "-o",
         "--output",
         type=_to_path,
-        help="An output directory (default: current directory).",
-        default=Path.cwd(),
+        help="An output directory.",
+        # The parser is cached, so don't freeze a current directory here.
+        #   Argparse passes string defaults through 'type' only when the option is omitted.
+        default=".",
     )
 
     return parser
@@ -1,27 +1,34 @@
-import gc
 import logging
 import signal
 import sys
-from configparser import RawConfigParser
-from typing import cast
-
-from pathlib3x import Path
-from rich.logging import RichHandler
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
 
 from .cli import get_cli_arg_parser
-from .scrapper import FilesCache, GumroadScrapper, GumroadSession
+
+if TYPE_CHECKING:
+    from .scrapper import FilesCache, PagesCache
 
 
-def _set_sigint_handler(files_cache: FilesCache) -> None:
+def _set_sigint_handler(files_cache: "FilesCache", pages_cache: "PagesCache") -> None:
     original_sigint_handler = signal.getsignal(signal.SIGINT)
 
     def _sigint_handler(signal, frame):
         files_cache.save()
+        pages_cache.save()
         original_sigint_handler(signal, frame)
 
     signal.signal(signal.SIGINT, _sigint_handler)
 
 
+def _read_config(file_path: Path) -> dict[str, dict[str, str]]:
+    from configparser import RawConfigParser
+
+    parser = RawConfigParser()
+    parser.read_string(file_path.read_text(encoding="utf-8"), source=str(file_path))
+    return {section: dict(parser.items(section)) for section in parser.sections()}
+
+
 def main() -> None:
     try:
         args = get_cli_arg_parser().parse_args()
@@ -29,6 +36,10 @@ def main() -> None:
         print(f"File not found: {str(e)}!")
         sys.exit(1)
 
+    from rich.logging import RichHandler
+
+    from .scrapper import FilesCache, GumroadScrapper, GumroadSession, PagesCache
+
     logging.basicConfig(
         level=logging.DEBUG if args.debug else logging.INFO,
         format="[%(name)s] %(message)s",
@@ -38,20 +49,25 @@ def main() -> None:
     logging.getLogger("requests").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-    config = RawConfigParser()
-    config.read(args.config)
+    config = _read_config(args.config)
 
     session = GumroadSession(
         app_session=config["user"]["app_session"],
         guid=config["user"]["guid"],
         user_agent=config["user"]["user_agent"],
     )
-    files_cache = FilesCache(cast("Path", args.config).parent / "gumroad.cache")
+    files_cache = FilesCache(cast(Path, args.config).parent / "gumroad.cache")
+    pages_cache = PagesCache(cast(Path, args.config).parent / "gumroad.pages.cache")
     scrapper = GumroadScrapper(
         session,
+        files_cache,
         root_folder=args.output,
         product_folder_tmpl=config["scrapper"]["product_folder_tmpl"],
         slash_replacement=config["scrapper"]["slash_replacement"],
+        max_workers=int(config["scrapper"].get("max_workers", 8)),
+        max_downloads=int(config["scrapper"].get("max_downloads", 8)),
+        max_large_downloads=int(config["scrapper"].get("max_large_downloads", 2)),
+        pages_cache=pages_cache,
     )
 
     try:
@@ -72,13 +88,10 @@ def main() -> None:
         else:
             creators = {}
 
-        files_cache.load()
-        _set_sigint_handler(files_cache)
+        _set_sigint_handler(files_cache, pages_cache)
 
         if links:
-            for link in links:
-                scrapper.scrap_product_page(link)
-                gc.collect()
+            scrapper.scrap_product_pages(link.strip() for link in links)
         else:
             scrapper.scrape_library(creators)
 
@@ -86,6 +99,7 @@ def main() -> None:
         logging.getLogger().exception("")
 
     files_cache.save()
+    pages_cache.save()
 
 
 if __name__ == "__main__":
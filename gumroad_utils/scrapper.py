@@ -1,35 +1,128 @@
-import json
 import logging
+import os
 import re
+import shutil
+import string
 import sys
+import threading
+import time
 from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import date
+from pathlib import Path
 
-import humanize
-from bs4 import BeautifulSoup
+import orjson
 from dateutil.parser import parse as parse_date
-from pathlib3x import Path
+from requests import HTTPError, RequestException
 from requests import Session as _RequestsSession
+from requests.adapters import HTTPAdapter
 from rich.progress import Progress as RichProgress
+from rich.progress import TaskID
+from selectolax.lexbor import LexborHTMLParser
+from urllib3.exceptions import HTTPError as _Urllib3Error
+from urllib3.util.retry import Retry
 
-__all__ = ["GumroadScrapper", "GumroadSession"]
+__all__ = ["FilesCache", "GumroadScrapper", "GumroadSession", "PagesCache"]
 
 _ARCHIVES_EXT = {"rar", "zip"}
+_INVALID_FILENAME_CHARS = '<>:"/\\|?*'
+# Files are opened with a default (small) buffer on purpose: 'BufferedWriter' hands writes
+# larger than its buffer straight to a file descriptor, without copying them.
+_BUFFER_SIZE = 1 << 20  # 1mb
+_PROGRESS_INTERVAL = 0.05  # seconds, i.e. 20 updates per second at most
+_LARGE_FILE_SIZE = 1 << 20  # 1mb
+_RANGE_PARTS = 4
+_IDENTITY_ENCODING = {"Accept-Encoding": "identity"}
+_COOKIE_VALUE_ESCAPES = str.maketrans({"+": "%2B", "/": "%2F", "=": "%3D"})
+_SIZE_UNITS = ("kB", "MB", "GB", "TB")
+_NOTHING_CACHED: frozenset[str] = frozenset()
+_CACHE_LOG_COMPACTION_THRESHOLD = 1000  # lines
+
+_CREATOR_URL = re.compile(r"https://([^.]+)\.gumroad\.com")
+_ACTION_BUTTONS = ".actions button"
+_PAYMENT_INFO = ".main > div:nth-child(1) > div"
+_LIBRARY_PAGE_DATA = 'script[data-component-name="LibraryPage"]'
+_DOWNLOAD_PAGE_DATA = 'script[data-component-name="DownloadPageWithContent"]'
+
+
+def _load_json_data(tree: LexborHTMLParser, selector: str) -> dict:
+    script = tree.css_first(selector)
+    return orjson.loads(script.text())
+
+
+# NOTE(PxINKY) Gumroad added a "file" type that's embedded into the page resulting in no download_url
+def _is_downloadable_file(item: dict) -> bool:
+    return item["type"] == "file" and item["download_url"] is not None
+
+
+def _iter_content_files(items: list[dict]) -> Iterator[dict]:
+    for item in items:
+        if item["type"] == "folder":
+            yield from _iter_content_files(item["children"])
+        elif _is_downloadable_file(item):
+            yield item
+
+
+def _allocate_file(file_path: Path, size: int) -> None:
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _content_length(headers: Mapping[str, str] | None) -> int | None:
+    content_length = headers.get("content-length") if headers is not None else None
+    return int(content_length) if content_length is not None else None
+
+
+# Never leave a half-written file behind, e.g. when a tool is interrupted in the middle of a save.
+def _write_atomically(file_path: Path, data: bytes) -> None:
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, file_path)
+
+
+def _wait_all(futures: list[Future], stop: threading.Event, *executors: ThreadPoolExecutor) -> None:
+    try:
+        for future in as_completed(futures):
+            future.result()
+    except BaseException:
+        # Running tasks can't be cancelled, so ask them to give up by themselves.
+        stop.set()
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+def _check_stopped(stop: threading.Event) -> None:
+    if stop.is_set():
+        raise RuntimeError("Scrapping has been interrupted!")
 
 
-def _load_json_data(soup: BeautifulSoup, data_component_name: str) -> dict:
-    script = soup.find(
-        "script",
-        attrs={
-            "class": "js-react-on-rails-component",
-            "data-component-name": data_component_name,
-        },
-    )
-    return json.loads(script.string)
+def _sanitize_cookie_value(value: str) -> str:
+    return value.translate(_COOKIE_VALUE_ESCAPES)
 
 
-def _sanitize_cookie_value(value: str) -> str:
-    return value.replace("+", "%2B").replace("/", "%2F").replace("=", "%3D")
+# Same as 'humanize.naturalsize', i.e. decimal units.
+def naturalsize(size: int) -> str:
+    if size < 1000:
+        return f"{size} Bytes"
+
+    value = float(size)
+    for unit in _SIZE_UNITS:
+        value /= 1000
+        if round(value, 1) < 1000:
+            break
+
+    return f"{value:.1f} {unit}"
 
 
 # https://www.xormedia.com/string-truncate-middle-with-ellipsis/
@@ -37,10 +130,79 @@ def shorten(s: str, n: int = 40) -> str:
     if len(s) <= n:
         return s
 
-    n_2 = int(n) / 2 - 3
-    n_1 = n - n_2 - 3
+    half = (n - 3) >> 1
+    return f"{s[:n - 3 - half]}..{s[-half:]}"
+
+
+class _ProgressReader:
+    def __init__(self, raw, stop: threading.Event, progress: RichProgress, task: TaskID | None) -> None:
+        self._raw = raw
+        self._stop = stop
+        self._progress = progress
+        self._task = task
+        self._pending = 0
+        self._last_update = time.monotonic()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        # Don't give up on a download that has already been read to the end.
+        if data:
+            _check_stopped(self._stop)
+
+        if self._task is None:
+            return data
+
+        self._pending += len(data)
+
+        now = time.monotonic()
+        if not data or now - self._last_update >= _PROGRESS_INTERVAL:
+            self._progress.advance(self._task, self._pending)
+            self._pending = 0
+            self._last_update = now
+
+        return data
+
+
+class _AdaptiveLimit:
+    def __init__(self, max_limit: int, window: float = 1.0) -> None:
+        self._max_limit = max_limit
+        self._limit = max(max_limit // 2, 1)
+        self._active = 0
+        self._condition = threading.Condition()
+
+        self._window = window
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._throughput = 0.0
+
+    def __enter__(self) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+
+    def __exit__(self, *args) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
 
-    return "{0}..{1}".format(s[:int(n_1)], s[-int(n_2):])
+    def record(self, size: int) -> None:
+        with self._condition:
+            self._window_bytes += size
+
+            elapsed = time.monotonic() - self._window_start
+            if elapsed < self._window:
+                return
+
+            throughput = self._window_bytes / elapsed
+            if throughput >= self._throughput * 0.8:
+                self._limit = min(self._limit + 1, self._max_limit)  # additive increase
+            else:
+                self._limit = max(self._limit // 2, 1)  # multiplicative decrease
+
+            self._throughput = throughput
+            self._window_start += elapsed
+            self._window_bytes = 0
+            self._condition.notify_all()
 
 
 class GumroadSession(_RequestsSession):
@@ -51,44 +213,132 @@ class GumroadSession(_RequestsSession):
         self.cookies.set("_gumroad_guid", guid)
         self.headers["User-Agent"] = user_agent
 
+        # Everything is fetched in parallel through this session, so keep enough connections alive.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
     @property
     def base_url(self) -> str:
         return "https://app.gumroad.com"
 
-    def get_soup(self, url: str) -> BeautifulSoup:
+    def get_tree(self, url: str) -> LexborHTMLParser:
         response = self.get(url, allow_redirects=False)
         response.raise_for_status()
-        return BeautifulSoup(response.content, "lxml")
+        return LexborHTMLParser(response.content)
 
 
 class FilesCache:
     def __init__(self, file_path: Path) -> None:
         self._file_path = file_path
+        # Every cached file is also appended to a log, which is merged into the cache file on save.
+        self._log_path = file_path.with_name(file_path.name + ".log")
+        self._log = None
         self._storage: dict[str, set] = defaultdict(set)
+        self._lock = threading.Lock()
         self._logger = logging.getLogger("cache")
         self.load()  # Load cache on initialization
 
     def load(self) -> None:
-        if not self._file_path.exists():
-            return
+        if self._file_path.exists():
+            data = orjson.loads(self._file_path.read_bytes())
+
+            with self._lock:
+                self._storage.update({k: set(v) for k, v in data.items()})
+
+        if self._log_path.exists():
+            lines = self._log_path.read_bytes().splitlines()
+            is_torn = False
 
-        with open(self._file_path, "r", encoding="utf-8") as f:
-            for k, v in json.load(f).items():
-                self._storage[k] = set(v)
+            with self._lock:
+                for line in lines:
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        is_torn = True
+                        continue
+                    self._storage[entry["p"]].add(entry["f"])
+
+            # Don't append after a torn line, it would corrupt the next entry.
+            if is_torn or len(lines) > _CACHE_LOG_COMPACTION_THRESHOLD:
+                self.save()
 
         self._logger.info("Cache has been loaded.")
 
     def save(self) -> None:
-        with open(self._file_path, "w", encoding="utf-8") as f:
-            json.dump(self._storage, f, default=list, indent=2)
+        with self._lock:
+            data = orjson.dumps(self._storage, default=list, option=orjson.OPT_INDENT_2)
+            _write_atomically(self._file_path, data)
+
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            self._log_path.unlink(missing_ok=True)
 
         self._logger.info("Cache has been saved.")
 
     def is_cached(self, product_id: str, file_id: str) -> bool:
-        return file_id in self._storage.get(product_id, []) 
+        # Don't index '_storage' directly, 'defaultdict' would store an empty set for every checked product.
+        return file_id in self._storage.get(product_id, _NOTHING_CACHED)
+
+    def is_fully_cached(self, product_id: str, file_ids: Iterable[str]) -> bool:
+        return self._storage.get(product_id, _NOTHING_CACHED).issuperset(file_ids)
 
     def cache(self, product_id: str, file_id: str) -> None:
-        self._storage[product_id].add(file_id)
+        with self._lock:
+            self._storage[product_id].add(file_id)
+
+            if self._log is None:
+                self._log = open(self._log_path, "ab")
+            self._log.write(orjson.dumps({"p": product_id, "f": file_id}) + b"\n")
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+
+class PagesCache:
+    def __init__(self, file_path: Path) -> None:
+        self._file_path = file_path
+        self._storage: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger("cache")
+        self.load()  # Load cache on initialization
+
+    def load(self) -> None:
+        if not self._file_path.exists():
+            return
+
+        try:
+            data = orjson.loads(self._file_path.read_bytes())
+        except orjson.JSONDecodeError:
+            self._logger.warning("Pages cache is corrupted, starting with an empty one.")
+            return
+
+        with self._lock:
+            self._storage.update(data)
+
+        self._logger.info("Pages cache has been loaded.")
+
+    def save(self) -> None:
+        with self._lock:
+            data = orjson.dumps(self._storage)
+            _write_atomically(self._file_path, data)
+
+        self._logger.info("Pages cache has been saved.")
+
+    def get(self, url: str) -> dict | None:
+        return self._storage.get(url)
+
+    def cache(self, url: str, page: dict) -> None:
+        with self._lock:
+            self._storage[url] = page
 
 
 class GumroadScrapper:
@@ -98,24 +348,46 @@ class GumroadScrapper:
         files_cache: FilesCache,
         root_folder: Path,
         product_folder_tmpl: str,
-        slash_replacement: str
+        slash_replacement: str,
+        max_workers: int = 8,
+        max_downloads: int = 8,
+        max_large_downloads: int = 2,
+        pages_cache: PagesCache | None = None,
     ) -> None:
         self._session = session
         self._root_folder = root_folder
         self._product_folder_tmpl = product_folder_tmpl
+        self._needs_price = "price" in {
+            re.split(r"[.\[]", field_name)[0]
+            for _, field_name, _, _ in string.Formatter().parse(product_folder_tmpl)
+            if field_name
+        }
         self._slash_replacement = slash_replacement
+        self._filename_escapes = str.maketrans({c: slash_replacement for c in _INVALID_FILENAME_CHARS})
+        self._max_workers = max_workers
+        self._max_downloads = max_downloads
+        self._max_large_downloads = max_large_downloads
+
+        self._downloads_limit = _AdaptiveLimit(max_downloads)
+        self._large_downloads_limit = threading.BoundedSemaphore(max_large_downloads)
 
         self._files_cache = files_cache
+        self._pages_cache = pages_cache
+        self._stop = threading.Event()
         self._logger = logging.getLogger("scraper")
 
+        # Rich allows only one live display at a time, so all downloads share it.
+        self._progress = RichProgress(expand=True)
+
     # Pages - Library
 
     def scrape_library(self, creators: set[str] = ".") -> None:
-        soup = self._session.get_soup(self._session.base_url + "/library")
-        self._detect_redirect(soup)
+        tree = self._session.get_tree(self._session.base_url + "/library")
+        self._detect_redirect(tree)
 
-        script = _load_json_data(soup, "LibraryPage")
+        script = _load_json_data(tree, _LIBRARY_PAGE_DATA)
 
+        purchases: list[tuple[str, date | None]] = []
         for result in script["results"]:
             # NOTE(PxINKY) Seems on very very rare occasions the profile can be missing the 'creator' object 
             # Gumroad has dissallowed the username "none" from being picked, so it makes a good choice here
@@ -128,16 +400,13 @@ class GumroadScrapper:
                     )
                 
             
-            creator_username = "none" 
-            # Gumroad added "?recommended_by=library" to the end of 'profile_url'
-            try:
-                creator_username = re.search(
-                    r"https:\/\/(.*)\.gumroad\.com\?recommended_by=library", creator_profile_url
-                ).group(1)
-            except:
-                self._logger.warning(
-                    "Could not find creator in profile_url"
-                    )
+            # Gumroad may add a query like "?recommended_by=library" to 'profile_url'.
+            match = _CREATOR_URL.match(creator_profile_url)
+            if match:
+                creator_username = match.group(1)
+            else:
+                creator_username = "none"
+                self._logger.warning("Could not find creator in profile_url")
             
             # NOTE(PxINKY): Swapping to ID as a static variable, we can use a try-catch to reassign it if the creator's name does exist!
             creator = result["product"]["creator_id"]
@@ -160,21 +429,49 @@ class GumroadScrapper:
                 continue
 
             updated_at = parse_date(result["product"]["updated_at"]).date()
-            self.scrap_product_page(result["purchase"]["download_url"], updated_at) 
+            purchases.append((result["purchase"]["download_url"], updated_at))
+
+        self._scrap_product_pages(purchases)
 
     
     # Pages - Product content
 
     def scrap_product_page(self, url: str, uploaded_at: date | None = None) -> None:
+        self._stop.clear()
+        with self._progress:
+            self._scrap_product_page(url, uploaded_at)
+
+    def scrap_product_pages(self, urls: Iterable[str]) -> None:
+        self._scrap_product_pages([(url, None) for url in urls])
+
+    def _scrap_product_pages(self, purchases: list[tuple[str, date | None]]) -> None:
+        self._stop.clear()
+        with self._progress, ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [
+                executor.submit(self._scrap_product_page, url, updated_at)
+                for url, updated_at in purchases
+            ]
+            _wait_all(futures, self._stop, executor)
+
+    def _scrap_product_page(self, url: str, uploaded_at: date | None = None) -> None:
+        _check_stopped(self._stop)
+
         if url.isalnum():
             url = f"{self._session.base_url}/d/{url}"
 
         self._logger.info("Scrapping %r...", url)
 
-        soup = self._session.get_soup(url)
-        self._detect_redirect(soup)
+        script, has_zip = self._scrap_download_page(url, uploaded_at)
 
-        script = _load_json_data(soup, "DownloadPageWithContent")
+        product_id = script["purchase"]["product_id"]
+        files = list(_iter_content_files(script["content"]["content_items"]))
+        file_ids = {item["id"] for item in files}
+        is_downloaded = self._files_cache.is_cached(product_id, "zip") or (
+            file_ids and self._files_cache.is_fully_cached(product_id, file_ids)
+        )
+        if is_downloaded:
+            self._logger.info("%r is already downloaded! Skipping.", script["purchase"]["product_name"])
+            return
 
         # NOTE(PxINKY) Gumroad filters the username (Page URL / Profile Link username) on creation/edit
         # but not the "name" (["creator"]["name"]) from having invalid characters
@@ -183,8 +480,11 @@ class GumroadScrapper:
         product_creator = self.sanitize_filename(script["creator"]["name"].strip())
         product_name = self.sanitize_filename(script["purchase"]["product_name"])
 
-        recipe_link = f"{self._session.base_url}/purchases/{script['purchase']['id']}/receipt"
-        price = self._scrap_recipe_page(recipe_link)
+        if self._needs_price:
+            recipe_link = f"{self._session.base_url}/purchases/{script['purchase']['id']}/receipt"
+            price = self._scrap_recipe_page(recipe_link)
+        else:
+            price = ""
         purchase_date = parse_date(script["purchase"]["created_at"]).date()
 
         try:
@@ -198,19 +498,14 @@ class GumroadScrapper:
             self._logger.info("'uploaded_at' is not available!")
             sys.exit()
 
-        product_folder: "Path" = self._root_folder / product_creator / product_folder_name
+        product_folder: Path = self._root_folder / product_creator / product_folder_name
 
         # NOTE(obsessedcake): We might be able to download everything in a single zip archive.
         #   Download all -> Download as ZIP
-        for action in soup.select(".actions button"):
-            if "ZIP" not in action.find(text=True):
-                continue
-
-            # NOTE(obsessedcake): Creators can publish an single archive as a content for the product.
-            #   If it's a case, let's download in a normal way.
-            if self._content_is_archive(soup):
-                break
-
+        #   Creators can publish an single archive as a content for the product.
+        #   If it's a case, let's download in a normal way.
+        is_archive = len(files) == 1 and files[0]["extension"].lower() in _ARCHIVES_EXT
+        if has_zip and not is_archive:
             self._logger.info(
                 "Downloading %r product of %r creator as a zip archive.",
                 product_name,
@@ -218,49 +513,88 @@ class GumroadScrapper:
             )
 
             zip_url = url.replace("/d/", "/zip/")
-            output = product_folder.append_suffix(".zip")
+            output = product_folder.parent / (product_folder.name + ".zip")
 
-            self._fancy_download_file(zip_url, Path("/"), output, transient=False)
+            headers = self._fetch_headers(zip_url)
+            if not self._ranged_download_file(product_id, "zip", zip_url, output, headers):
+                self._fancy_download_file(
+                    product_id,
+                    "zip",
+                    zip_url,
+                    Path("/"),
+                    output,
+                    size_hint=_content_length(headers),
+                    transient=False,
+                )
             return
 
         self._logger.info("Downloading %r product of %r creator...", product_name, product_creator)
         self._download_content(script, product_folder)
 
-    def _content_is_archive(self, product_page_soup: BeautifulSoup) -> bool:
-        tree_elements = product_page_soup.select(".js-file-list-element")
-        if len(tree_elements) > 1:
-            return False
+    def _scrap_download_page(self, url: str, uploaded_at: date | None) -> tuple[dict, bool]:
+        page = self._pages_cache.get(url) if self._pages_cache else None
+        # Library knows when a product was updated, so don't trust an old page.
+        if page and uploaded_at and page["uploaded_at"] != uploaded_at.isoformat():
+            page = None
 
-        file_type = tree_elements[0].select_one("li:nth-child(1)").string.strip().lower()
-        return file_type in _ARCHIVES_EXT
+        headers = {"If-None-Match": page["etag"]} if page else None
+        response = self._session.get(url, allow_redirects=False, headers=headers)
+        if page and response.status_code == 304:
+            self._logger.debug("%r hasn't changed since the last run.", url)
+            return page["script"], page["has_zip"]
+
+        response.raise_for_status()
+
+        tree = LexborHTMLParser(response.content)
+        self._detect_redirect(tree)
+
+        script = _load_json_data(tree, _DOWNLOAD_PAGE_DATA)
+        has_zip = any("ZIP" in action.text() for action in tree.css(_ACTION_BUTTONS))
+
+        etag = response.headers.get("ETag")
+        if self._pages_cache and etag:
+            self._pages_cache.cache(
+                url,
+                {
+                    "etag": etag,
+                    "uploaded_at": uploaded_at.isoformat() if uploaded_at else None,
+                    "script": script,
+                    "has_zip": has_zip,
+                },
+            )
+
+        return script, has_zip
 
-    
     # Item - scanner / Downloader  
     
     def _download_content(self, script: dict, parent_folder: Path) -> None:
         product_id = script["purchase"]["product_id"]
+        downloads: list[tuple] = []
 
         def _traverse_tree(items: list[dict], tree_path: Path, parent_folder: Path) -> None:
-            files_count = 0
-            file_idx = 0
-
+            folders: list[dict] = []
+            files: list[dict] = []
             for item in items:
-                if item["type"] != "folder":
-                    files_count += 1
-                    continue
+                if item["type"] == "folder":
+                    folders.append(item)
+                elif _is_downloadable_file(item):
+                    files.append(item)
+            files_count = len(files)
 
+            for item in folders:
                 folder_name = item["name"]
+                file_ids = {file["id"] for file in _iter_content_files(item["children"])}
+                if self._files_cache.is_fully_cached(product_id, file_ids):
+                    self._logger.debug("'%s' folder is already downloaded! Skipping.", tree_path / folder_name)
+                    continue
+
                 _traverse_tree(
                     item["children"],
                     tree_path / folder_name.strip(),
                     parent_folder / folder_name.strip(),
                 )
 
-            for item in items:
-                # NOTE(PxINKY) Gumroad added a "file" type that's embedded into the page resulting in no download_url
-                if item["type"] != "file" or item["download_url"] is None:
-                    continue
-
+            for file_idx, item in enumerate(files, 1):
                 file_id = item["id"]
                 # Sanitize the file name
                 # Issue arises if the file_name is something like: 'File 1.0 / 2.0'
@@ -269,30 +603,55 @@ class GumroadScrapper:
                 file_type = item["extension"].lower()
                 file_url = self._session.base_url + item["download_url"]
 
-                file_path = (parent_folder / file_name).with_suffix("." + file_type)
-                file_idx += 1
+                # 'file_name' has no extension but may contain dots, e.g. 'File 1.0'.
+                file_path = parent_folder / f"{file_name}.{file_type}"
 
-                self._fancy_download_file(
-                    product_id,
-                    file_id,
-                    file_url,
-                    tree_path,
-                    file_path,
-                    files_count,
-                    file_idx,
-                    transient=True,
+                if self._files_cache.is_cached(product_id, file_id):
+                    self._logger.debug("'%s' is already downloaded! Skipping.", tree_path / file_path.name)
+                    continue
+
+                downloads.append(
+                    (product_id, file_id, file_url, tree_path, file_path, files_count, file_idx)
                 )
 
         _traverse_tree(script["content"]["content_items"], Path("/"), parent_folder)
+        if not downloads:
+            return
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            sizes = [
+                _content_length(headers)
+                for headers in executor.map(self._fetch_headers, [download[2] for download in downloads])
+            ]
+
+        futures: list[Future] = []
+        with (
+            ThreadPoolExecutor(max_workers=self._max_downloads) as small_executor,
+            ThreadPoolExecutor(max_workers=self._max_large_downloads) as large_executor,
+        ):
+            for download, size in zip(downloads, sizes):
+                if size == 0:
+                    _, _, _, tree_path, file_path, *_ = download
+                    self._logger.warning(
+                        "Failed to download '%s' file, received zero content length!", tree_path / file_path.name
+                    )
+                    continue
+
+                executor = large_executor if size and size >= _LARGE_FILE_SIZE else small_executor
+                futures.append(
+                    executor.submit(self._fancy_download_file, *download, size_hint=size, transient=True)
+                )
+
+            _wait_all(futures, self._stop, small_executor, large_executor)
 
 
     # Pages - Recipe
    
     def _scrap_recipe_page(self, url: str) -> str:
-        soup = self._session.get_soup(url)
-        payment_info_element = soup.select_one(".main > div:nth-child(1) > div")
+        tree = self._session.get_tree(url)
+        payment_info_element = tree.css_first(_PAYMENT_INFO)
         if payment_info_element:
-            payment_info = payment_info_element.string
+            payment_info = payment_info_element.text()
             if payment_info:
                 price = payment_info.strip().split("\n")[0]  # \n$9.99\n— VISA *0000
                 return price
@@ -304,10 +663,8 @@ class GumroadScrapper:
     # (PxINKY) - File name sanitizer
     
     def sanitize_filename(self, filename: str) -> str:
-        invalid_chars = r'<>:"/\|?*'
-        # Replace invalid characters and spaces with underscores
-        sanitized_filename = ''.join(self._slash_replacement if c in invalid_chars else c for c in filename)
-        return sanitized_filename
+        # Replace invalid characters with 'slash_replacement'
+        return filename.translate(self._filename_escapes)
 
     
     # File downloader
@@ -322,48 +679,172 @@ class GumroadScrapper:
         files_total_count: int = 0,
         file_idx: int = 0,
         *,
+        size_hint: int | None = None,
         transient: bool,
     ) -> None:
+        _check_stopped(self._stop)
+
         tree_file_path = tree_path / file_path.name
         if self._files_cache.is_cached(product_id, file_id):
             self._logger.debug("'%s' is already downloaded! Skipping.", tree_file_path)
             return
 
-        response = self._session.get(url, stream=True)
-        response.raise_for_status()
+        is_large = size_hint is not None and size_hint >= _LARGE_FILE_SIZE
+        with self._large_downloads_limit if is_large else self._downloads_limit:
+            response = self._session.get(url, stream=True)
+            response.raise_for_status()
 
-        total_size_in_bytes = int(response.headers.get("content-length", 0))
-        if total_size_in_bytes == 0:
-            self._logger.warning(
-                "Failed to download '%s' file, received zero content length!", tree_file_path
-            )
-            return
+            total_size_in_bytes = int(response.headers.get("content-length", 0))
+            if total_size_in_bytes == 0:
+                self._logger.warning(
+                    "Failed to download '%s' file, received zero content length!", tree_file_path
+                )
+                return
 
-        human_size = humanize.naturalsize(total_size_in_bytes)
-        if transient:
-            task_desc = f"[{file_idx}/{files_total_count}] Downloading '{shorten(file_path.name)}' ({human_size})..."
-        else:
-            task_desc = "Downloading {human_size} file..."
+            human_size = naturalsize(total_size_in_bytes)
+            if transient:
+                task_desc = (
+                    f"[{file_idx}/{files_total_count}] "
+                    f"Downloading '{shorten(file_path.name)}' ({human_size})..."
+                )
+            else:
+                task_desc = f"Downloading {human_size} file..."
 
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+
+            response.raw.decode_content = True
+
+            # Rich doesn't render anything when output isn't a terminal.
+            progress = self._progress
+            task = None
+            if progress.console.is_terminal:
+                task = progress.add_task(task_desc, total=total_size_in_bytes)
+            source = _ProgressReader(response.raw, self._stop, progress, task)
 
-        with RichProgress(expand=True, transient=transient) as progress:
-            task = progress.add_task(task_desc, total=total_size_in_bytes)
+            # A preallocated file looks complete by its size, so never leave an unfinished one behind.
+            try:
+                mode = "wb"
+                if total_size_in_bytes >= _LARGE_FILE_SIZE:
+                    _allocate_file(file_path, total_size_in_bytes)
+                    mode = "r+b"
+
+                with file_path.open(mode) as file:
+                    shutil.copyfileobj(source, file, _BUFFER_SIZE)
+                    file.truncate()  # Decoded content might be shorter than allocated.
+            except BaseException:
+                file_path.unlink(missing_ok=True)
+                raise
 
-            with file_path.open("wb") as file:
-                for chunk in response.iter_content(chunk_size=4096):  # 4kb
-                    if chunk:  # filter out keep-alive new chunks
-                        progress.advance(task, len(chunk))
-                        file.write(chunk)
+            if task is not None and transient:
+                progress.remove_task(task)
+
+            if total_size_in_bytes < _LARGE_FILE_SIZE:
+                self._downloads_limit.record(total_size_in_bytes)
 
         self._files_cache.cache(product_id, file_id)
-        self._files_cache.save() # save after each sucsessful download
         self._logger.info("Downloaded '%s' to '%s'", tree_file_path, file_path)
 
 
+    # Returns False if the server can't serve the file in ranges.
+    def _ranged_download_file(
+        self, product_id: str, file_id: str, url: str, file_path: Path, headers: Mapping[str, str] | None
+    ) -> bool:
+        if not hasattr(os, "pwrite") or headers is None:
+            return False
+
+        if self._files_cache.is_cached(product_id, file_id):
+            self._logger.debug("'%s' is already downloaded! Skipping.", file_path.name)
+            return True
+
+        total_size_in_bytes = _content_length(headers) or 0
+        if headers.get("accept-ranges") != "bytes":
+            return False
+        if total_size_in_bytes < _RANGE_PARTS * _LARGE_FILE_SIZE:
+            return False
+
+        human_size = naturalsize(total_size_in_bytes)
+        task = self._progress.add_task(
+            f"Downloading {human_size} file in {_RANGE_PARTS} parts...", total=total_size_in_bytes
+        )
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        _allocate_file(file_path, total_size_in_bytes)
+        fd = os.open(file_path, os.O_WRONLY)
+        # A failed part only stops its siblings, the file is downloaded in one piece then.
+        parts_stop = threading.Event()
+        is_downloaded = False
+        try:
+            with self._large_downloads_limit, ThreadPoolExecutor(max_workers=_RANGE_PARTS) as executor:
+                futures = [
+                    executor.submit(
+                        self._download_range,
+                        url,
+                        fd,
+                        part * total_size_in_bytes // _RANGE_PARTS,
+                        (part + 1) * total_size_in_bytes // _RANGE_PARTS - 1,
+                        task,
+                        parts_stop,
+                    )
+                    for part in range(_RANGE_PARTS)
+                ]
+                _wait_all(futures, parts_stop, executor)
+            is_downloaded = all(future.result() for future in futures)
+        finally:
+            os.close(fd)
+            if not is_downloaded:
+                file_path.unlink(missing_ok=True)
+                self._progress.remove_task(task)
+
+        if not is_downloaded:
+            self._logger.debug("Server rejected a range request for %r, falling back to a single stream.", url)
+            return False
+
+        self._files_cache.cache(product_id, file_id)
+        self._logger.info("Downloaded '%s' to '%s'", file_path.name, file_path)
+        return True
+
+    def _download_range(
+        self, url: str, fd: int, start: int, end: int, task: TaskID, stop: threading.Event
+    ) -> bool:
+        # Parts of an encoded body can't be decoded on their own.
+        headers = {"Range": f"bytes={start}-{end}", **_IDENTITY_ENCODING}
+        try:
+            with self._session.get(url, headers=headers, stream=True) as response:
+                if response.status_code != 206:
+                    stop.set()
+                    return False
+
+                reader = _ProgressReader(response.raw, self._stop, self._progress, task)
+
+                offset = start
+                while not stop.is_set() and (chunk := reader.read(_BUFFER_SIZE)):
+                    os.pwrite(fd, chunk, offset)
+                    offset += len(chunk)
+        except (RequestException, _Urllib3Error):
+            stop.set()
+            return False
+
+        return not stop.is_set()
+
+    def _fetch_headers(self, url: str) -> Mapping[str, str] | None:
+        _check_stopped(self._stop)
+
+        try:
+            response = self._session.head(url, allow_redirects=True, headers=_IDENTITY_ENCODING)
+            response.raise_for_status()
+        except HTTPError as e:
+            # A download would get the same answer, unless a server just doesn't allow HEAD.
+            if 400 <= e.response.status_code < 500 and e.response.status_code != 405:
+                raise
+            return None
+        except RequestException:
+            return None
+
+        return response.headers
+
     # Utils
 
-    def _detect_redirect(self, soup: BeautifulSoup) -> None:
-        text = soup.find(text=True, recursive=False)
+    def _detect_redirect(self, tree: LexborHTMLParser) -> None:
+        text = tree.body.text(deep=False) if tree.body else None
         if text and ("You are being" in text):  # You are being redirected.
             raise RuntimeError("You are being redirected to a login page!")
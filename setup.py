@@ -4,13 +4,11 @@ with open("README.md", "r") as f:
     long_description = f.read()
 
 install_requires = [
-    "beautifulsoup4",
-    "humanize",
-    "lxml",
-    "pathlib3x",
+    "orjson",
     "python-dateutil",
     "requests>=2.26.0",
     "rich>=13.0.0",
+    "selectolax>=0.3",
 ]
 
 extras_require = {